@@ -1,48 +1,60 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-import json
+from selenium.common.exceptions import TimeoutException
+from bs4 import BeautifulSoup, SoupStrainer
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import re
-from urllib.parse import urljoin, urlparse
-import time
+from urllib.parse import urljoin
+
+# Common patterns in content API endpoints, joined into a single alternation
+# so each URL is scanned once instead of once per pattern
+_API_RE = re.compile('|'.join([
+    r'/api/content',
+    r'/api/articles',
+    r'/api/posts',
+    r'/wp-json/wp/v2',
+    r'/load-more',
+    r'page=\d+',
+    r'offset=\d+',
+    r'limit=\d+'
+]))
+_PAGE_RE = re.compile(r'page/\d+|page=\d+')
+_NUM_RE = re.compile(r'\d+')
+_LOC_STRAINER = SoupStrainer('loc')
+
+# Common field names for content in API response items
+_CONTENT_FIELDS = ('title', 'content', 'excerpt', 'description', 'text')
+_LINK_FIELDS = ('url', 'link', 'permalink')
+
+# Infinite-scroll simulation stops after this many scrolls even if the page keeps growing
+MAX_SCROLLS = 10
+
+# Shared session so sitemap and API fetches reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
 
 def setup_network_monitoring(driver):
     """Enable network monitoring in Chrome"""
     driver.execute_cdp_cmd('Network.enable', {})
-    requests = []
+    network_requests = []
     
     def capture_request(request):
-        requests.append(request)
+        network_requests.append(request)
     
     driver.execute_cdp_cmd('Network.setRequestInterception', {'patterns': [{'urlPattern': '*'}]})
     driver.on('Network.requestIntercepted', capture_request)
     
-    return requests
+    return network_requests
 
-def analyze_network_requests(requests, base_url):
+def analyze_network_requests(network_requests, base_url):
     """Analyze network requests to find content endpoints"""
-    content_endpoints = []
-    
-    # Common patterns in content API endpoints
-    api_patterns = [
-        r'/api/content',
-        r'/api/articles',
-        r'/api/posts',
-        r'/wp-json/wp/v2',
-        r'/load-more',
-        r'page=\d+',
-        r'offset=\d+',
-        r'limit=\d+'
-    ]
-    
-    for request in requests:
-        url = request.get('url', '')
-        if any(re.search(pattern, url) for pattern in api_patterns):
-            content_endpoints.append(url)
-            
-    return content_endpoints
+    urls = (request.get('url', '') for request in network_requests)
+    return [url for url in urls if _API_RE.search(url)]
 
 def find_pagination_info(driver):
     """Find pagination information using various methods"""
@@ -54,23 +66,22 @@ def find_pagination_info(driver):
     
     # Method 1: Check rel="next" links
     try:
-        next_links = driver.find_elements(By.CSS_SELECTOR, 'link[rel="next"]')
-        pagination_info['next_links'].extend([link.get_attribute('href') for link in next_links])
+        next_links = driver.execute_script(
+            "return Array.from(document.querySelectorAll('link[rel=\"next\"]'), link => link.href);"
+        )
+        pagination_info['next_links'].extend(next_links)
     except:
         pass
         
     # Method 2: Check sitemap for pagination patterns
     try:
         sitemap_url = urljoin(driver.current_url, '/sitemap.xml')
-        response = requests.get(sitemap_url)
+        response = _SESSION.get(sitemap_url, timeout=10)
         if response.ok:
-            soup = BeautifulSoup(response.text, 'xml')
-            urls = soup.find_all('url')
-            page_pattern = re.compile(r'page/\d+|page=\d+')
-            pagination_info['next_links'].extend([
-                url.loc.text for url in urls 
-                if page_pattern.search(url.loc.text)
-            ])
+            # Only <loc> text is used, so nothing else is built into the tree
+            soup = BeautifulSoup(response.content, 'xml', parse_only=_LOC_STRAINER)
+            locs = (loc.text for loc in soup.find_all('loc'))
+            pagination_info['next_links'].extend(loc for loc in locs if _PAGE_RE.search(loc))
     except:
         pass
     
@@ -78,7 +89,7 @@ def find_pagination_info(driver):
     try:
         pagination_elements = driver.find_elements(By.CSS_SELECTOR, '.pagination, .nav-links, .pager')
         for element in pagination_elements:
-            numbers = re.findall(r'\d+', element.text)
+            numbers = _NUM_RE.findall(element.text)
             if numbers:
                 pagination_info['total_pages'] = max(map(int, numbers))
                 current = element.find_element(By.CSS_SELECTOR, '.current, .active')
@@ -89,26 +100,37 @@ def find_pagination_info(driver):
         
     return pagination_info
 
+def wait_for_scroll_growth(driver, last_height, timeout=3):
+    """Wait until the page grows past last_height and return the new height"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            lambda d: d.execute_script("return document.body.scrollHeight") > last_height
+        )
+    except TimeoutException:
+        pass
+    return driver.execute_script("return document.body.scrollHeight")
+
 def extract_dynamic_content(driver):
     """Extract content that may be loaded dynamically"""
     content = []
     
     # Monitor network requests
-    requests = setup_network_monitoring(driver)
+    network_requests = setup_network_monitoring(driver)
     
     # Initial scroll to trigger content loading
+    last_height = driver.execute_script("return document.body.scrollHeight")
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(2)
+    wait_for_scroll_growth(driver, last_height)
     
     # Analyze network requests
-    content_endpoints = analyze_network_requests(requests, driver.current_url)
+    content_endpoints = analyze_network_requests(network_requests, driver.current_url)
     
     # Directly fetch content from APIs if found
     for endpoint in content_endpoints:
         try:
-            response = requests.get(endpoint)
+            response = _SESSION.get(endpoint, timeout=10)
             if response.ok:
-                data = response.json()
+                data = orjson.loads(response.content)
                 # Extract content from API response
                 content.extend(parse_api_response(data))
         except:
@@ -129,10 +151,9 @@ def extract_dynamic_content(driver):
     # If no pagination found, try infinite scroll simulation
     elif not content_endpoints:
         last_height = driver.execute_script("return document.body.scrollHeight")
-        while True:
+        for _ in range(MAX_SCROLLS):
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            new_height = driver.execute_script("return document.body.scrollHeight")
+            new_height = wait_for_scroll_growth(driver, last_height)
             if new_height == last_height:
                 break
             last_height = new_height
@@ -159,15 +180,11 @@ def extract_from_item(item):
     """Extract content from individual API response items"""
     content = []
     
-    # Common field names for content
-    content_fields = ['title', 'content', 'excerpt', 'description', 'text']
-    link_fields = ['url', 'link', 'permalink']
-    
-    for field in content_fields:
+    for field in _CONTENT_FIELDS:
         if field in item and isinstance(item[field], str):
             content.append(f"[{field.upper()}] {item[field]}")
             
-    for field in link_fields:
+    for field in _LINK_FIELDS:
         if field in item and isinstance(item[field], str):
             content.append(f"[LINK] {item[field]}")
             
@@ -176,7 +193,7 @@ def extract_from_item(item):
 # Add these functions to your existing scraper
 def load_more_content(driver, base_url):
     """Enhanced content loading with search engine techniques"""
-    all_links = []
+    all_links = set()
     
     # First try API/network monitoring approach
     content = extract_dynamic_content(driver)
@@ -186,10 +203,10 @@ def load_more_content(driver, base_url):
         if item.startswith('[LINK]'):
             link = item.split('[LINK]')[1].strip()
             if link.startswith(base_url):
-                all_links.append(link)
+                all_links.add(link)
     
     # If no links found, fall back to existing methods
     if not all_links:
         all_links = gather_page_content(driver, base_url)
         
-    return list(set(all_links))
\ No newline at end of file
+    return list(all_links)
\ No newline at end of file
@@ -1,9 +1,13 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-import re
-import os
+from urllib.parse import urlparse
+from scrape_utils import (
+    absolute_url, collect_links, content_elements, content_xpath, crawl_levels,
+    fetch_document, fetch_html, site_hosts,
+)
+
+_TEXT_TAGS = frozenset(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'])
+_CONTENT_TAGS = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'a', 'img']
+_CONTENT_XPATH = content_xpath(_CONTENT_TAGS)
 
 def is_valid_url(url):
     try:
@@ -13,41 +17,26 @@ def is_valid_url(url):
         return False
 
 def clean_text(text):
-    return re.sub(r'\s+', ' ', text).strip()
+    return ' '.join(text.split())
 
-def should_exclude(element):
-    exclude_classes = ['nav', 'menu', 'footer', 'sidebar', 'advertisement', 'cookie', 'popup']
-    exclude_ids = ['nav', 'menu', 'footer', 'sidebar', 'ad']
-    
-    for parent in element.parents:
-        if parent.has_attr('class'):
-            if any(cls in parent.get('class', []) for cls in exclude_classes):
-                return True
-        if parent.has_attr('id'):
-            if any(id in parent.get('id', '') for id in exclude_ids):
-                return True
-    
-    return False
-
-def extract_content(soup, base_url):
+def extract_content(doc, base_url):
     content = []
     resources = []
 
-    for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'a', 'img']):
-        if not should_exclude(element):
-            if element.name in ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li']:
-                text = clean_text(element.get_text())
-                if text and len(text) > 20:
-                    content.append(text)
-            elif element.name == 'a':
-                href = element.get('href')
-                if href and href.endswith(('.pdf', '.doc', '.docx', '.xls', '.xlsx')):
-                    resources.append(f"Document: {urljoin(base_url, href)}")
-            elif element.name == 'img':
-                src = element.get('src')
-                alt = element.get('alt', '')
-                if src:
-                    resources.append(f"Image: {urljoin(base_url, src)} - {alt}")
+    for element in content_elements(doc, _CONTENT_XPATH):
+        if element.tag in _TEXT_TAGS:
+            text = clean_text(element.text_content())
+            if text and len(text) > 20:
+                content.append(text)
+        elif element.tag == 'a':
+            href = element.get('href')
+            if href and href.endswith(('.pdf', '.doc', '.docx', '.xls', '.xlsx')):
+                resources.append(f"Document: {absolute_url(base_url, href)}")
+        elif element.tag == 'img':
+            src = element.get('src')
+            alt = element.get('alt', '')
+            if src:
+                resources.append(f"Image: {absolute_url(base_url, src)} - {alt}")
 
     return content, resources
 
@@ -55,44 +44,49 @@ def get_company_name(url):
     parsed_url = urlparse(url)
     return parsed_url.netloc.split('.')[-2]
 
-def scrape_page(url, depth, max_depth, visited):
-    if depth > max_depth or url in visited:
-        return [], []
-
-    visited.add(url)
-    try:
-        response = requests.get(url, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        content, resources = extract_content(soup, url)
-        
-        if depth < max_depth:
-            for link in soup.find_all('a', href=True):
-                next_url = urljoin(url, link['href'])
-                if is_valid_url(next_url) and urlparse(next_url).netloc == urlparse(url).netloc:
-                    sub_content, sub_resources = scrape_page(next_url, depth + 1, max_depth, visited)
-                    content.extend(sub_content)
-                    resources.extend(sub_resources)
-        
-        return content, resources
+def scrape_page(url, allowed_hosts, follow_links):
+    doc = fetch_document(url)
+    if doc is None:
+        return ([], []), {}
+    
+    content, resources = extract_content(doc, doc.base_url)
     
-    except Exception as e:
-        st.error(f"Error scraping {url}: {str(e)}")
-        return [], []
+    links = collect_links(doc, allowed_hosts) if follow_links else {}
+    
+    return (content, resources), links
+
+def scrape_site(url, max_depth):
+    content = []
+    resources = []
+    allowed_hosts = site_hosts(url)
+
+    def scrape(page_url, follow_links):
+        return scrape_page(page_url, allowed_hosts, follow_links)
+
+    def merge(page_url, page):
+        page_content, page_resources = page
+        content.extend(page_content)
+        resources.extend(page_resources)
+
+    crawl_levels(url, max_depth, scrape, merge)
+    return content, resources
 
 def main():
     st.title("Competitor Analysis Web Scraper")
 
     url = st.text_input("Enter the website URL to scrape:")
     max_depth = st.number_input("Enter the maximum depth to scrape:", min_value=0, max_value=2, value=1, step=1)
+    refetch = st.checkbox("Refetch pages instead of reusing ones fetched in the last hour", value=False)
     
     if st.button("Scrape"):
         if not is_valid_url(url):
             st.error("Please enter a valid URL.")
             return
         
+        if refetch:
+            fetch_html.clear()
         st.info("Scraping in progress...")
-        content, resources = scrape_page(url, 0, max_depth, set())
+        content, resources = scrape_site(url, max_depth)
         
         if content or resources:
             st.subheader("Extracted Content Preview")
@@ -114,19 +108,19 @@ def main():
         company_name = get_company_name(url)
         filename = f"{company_name}_analysis.txt"
         
+        # Build the report once and hand the same string to both the file and
+        # the download button
+        file_content = ''.join([
+            "Extracted Content:\n\n",
+            ''.join(f"{item}\n\n" for item in content),
+            "\nExtracted Resources:\n\n",
+            ''.join(f"{item}\n" for item in resources),
+        ])
         with open(filename, "w", encoding="utf-8") as f:
-            f.write("Extracted Content:\n\n")
-            for item in content:
-                f.write(f"{item}\n\n")
-            f.write("\nExtracted Resources:\n\n")
-            for item in resources:
-                f.write(f"{item}\n")
+            f.write(file_content)
         
         st.success(f"Analysis completed! Content saved to {filename}")
         
-        with open(filename, "r", encoding="utf-8") as f:
-            file_content = f.read()
-        
         st.download_button(label="Download Analysis", data=file_content, file_name=filename, mime="text/plain")
 
 if __name__ == "__main__":
@@ -1,11 +1,18 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 import re
-import json
+import orjson
 from collections import defaultdict
-import hashlib
+from scrape_utils import (
+    absolute_url, collect_links, content_elements, content_xpath, crawl_levels,
+    fetch_document, fetch_html, site_hosts,
+)
+
+_TEXT_TAGS = frozenset(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'])
+_CONTENT_TAGS = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'a', 'img']
+_BLOG_KEYWORDS = ('blog', 'post', 'article', 'news')
+_BLOG_RE = re.compile('|'.join(_BLOG_KEYWORDS), re.IGNORECASE)
+_CONTENT_XPATH = content_xpath(_CONTENT_TAGS)
 
 def is_valid_url(url):
     try:
@@ -15,55 +22,36 @@ def is_valid_url(url):
         return False
 
 def clean_text(text):
-    return re.sub(r'\s+', ' ', text).strip()
+    return ' '.join(text.split())
 
-def should_exclude(element):
-    exclude_classes = ['nav', 'menu', 'footer', 'sidebar', 'advertisement', 'cookie', 'popup']
-    exclude_ids = ['nav', 'menu', 'footer', 'sidebar', 'ad']
-    
-    for parent in element.parents:
-        if parent.has_attr('class'):
-            if any(cls in parent.get('class', []) for cls in exclude_classes):
-                return True
-        if parent.has_attr('id'):
-            if any(id in parent.get('id', '') for id in exclude_ids):
-                return True
-    
-    return False
-
-def extract_content(soup, base_url, include_blog_posts):
+def extract_content(doc, base_url, include_blog_posts):
     content = defaultdict(list)
     seen_content = set()
     
-    for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'a', 'img']):
-        if should_exclude(element):
-            continue
-
-        if element.name in ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li']:
-            text = clean_text(element.get_text())
+    for element in content_elements(doc, _CONTENT_XPATH):
+        if element.tag in _TEXT_TAGS:
+            text = clean_text(element.text_content())
             if text and len(text) > 20:
-                content_hash = hashlib.md5(text.encode()).hexdigest()
-                if content_hash not in seen_content:
-                    seen_content.add(content_hash)
-                    if element.name.startswith('h'):
+                if text not in seen_content:
+                    seen_content.add(text)
+                    if element.tag.startswith('h'):
                         content['headers'].append(text)
                     else:
                         content['paragraphs'].append(text)
-        elif element.name == 'a':
+        elif element.tag == 'a':
             href = element.get('href')
             if href:
                 if href.startswith(('http', 'https')):
                     content['external_links'].append(href)
                 elif href.startswith('/'):
-                    content['internal_links'].append(urljoin(base_url, href))
-        elif element.name == 'img':
+                    content['internal_links'].append(absolute_url(base_url, href))
+        elif element.tag == 'img':
             src = element.get('src')
-            alt = element.get('alt', '')
             if src:
-                content['images'].append({
-                    'url': urljoin(base_url, src),
-                    'alt_text': alt
-                })
+                # Parallel lists rather than a dict per image; the UI only
+                # ever needs the URLs
+                content['images'].append(absolute_url(base_url, src))
+                content['image_alts'].append(element.get('alt', ''))
 
     if not include_blog_posts:
         content['paragraphs'] = [p for p in content['paragraphs'] if not is_blog_post(p)]
@@ -72,37 +60,33 @@ def extract_content(soup, base_url, include_blog_posts):
 
 def is_blog_post(text):
     # This is a simple heuristic. You might want to refine this based on your specific needs.
-    blog_keywords = ['blog', 'post', 'article', 'news']
-    return any(keyword in text.lower() for keyword in blog_keywords)
+    return _BLOG_RE.search(text) is not None
 
-def scrape_page(url, depth, max_depth, visited, include_blog_posts):
-    if depth > max_depth or url in visited:
-        return {}
-
-    visited.add(url)
-    try:
-        response = requests.get(url, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        content = extract_content(soup, url, include_blog_posts)
-        content['url'] = url
-        
-        if depth < max_depth:
-            for link in soup.find_all('a', href=True):
-                next_url = urljoin(url, link['href'])
-                if is_valid_url(next_url) and urlparse(next_url).netloc == urlparse(url).netloc:
-                    sub_content = scrape_page(next_url, depth + 1, max_depth, visited, include_blog_posts)
-                    for key, value in sub_content.items():
-                        if isinstance(value, list):
-                            content[key].extend(value)
-                        elif key not in content:
-                            content[key] = value
-        
-        return content
+def scrape_page(url, include_blog_posts, allowed_hosts, follow_links):
+    doc = fetch_document(url)
+    if doc is None:
+        return {}, {}
+    
+    content = extract_content(doc, doc.base_url, include_blog_posts)
+    
+    links = collect_links(doc, allowed_hosts) if follow_links else {}
     
-    except Exception as e:
-        st.error(f"Error scraping {url}: {str(e)}")
-        return {}
+    return content, links
+
+def scrape_site(url, max_depth, include_blog_posts):
+    content = defaultdict(list)
+    allowed_hosts = site_hosts(url)
+
+    def scrape(page_url, follow_links):
+        return scrape_page(page_url, include_blog_posts, allowed_hosts, follow_links)
+
+    def merge(page_url, page_content):
+        content.setdefault('url', page_url)
+        for key, value in page_content.items():
+            content[key].extend(value)
+
+    crawl_levels(url, max_depth, scrape, merge)
+    return content
 
 def main():
     st.title("Advanced Web Scraper for Competitor Analysis")
@@ -115,6 +99,7 @@ def main():
 
     url = st.text_input("Enter the website URL to scrape:")
     max_depth = st.number_input("Enter the maximum depth to scrape:", min_value=0, max_value=5, value=1, step=1)
+    refetch = st.checkbox("Refetch pages instead of reusing ones fetched in the last hour", value=False)
     include_blog_posts = st.checkbox("Include blog posts", value=False)
     
     if st.button("Scrape"):
@@ -122,8 +107,10 @@ def main():
             st.error("Please enter a valid URL.")
             return
         
+        if refetch:
+            fetch_html.clear()
         st.info("Scraping in progress...")
-        st.session_state.content = scrape_page(url, 0, max_depth, set(), include_blog_posts)
+        st.session_state.content = scrape_site(url, max_depth, include_blog_posts)
         st.session_state.selected_content = defaultdict(list)
         
     if st.session_state.content:
@@ -146,19 +133,20 @@ def main():
         
         st.session_state.selected_content['images'] = st.multiselect(
             "Select images to include:",
-            [img['url'] for img in st.session_state.content['images']],
+            st.session_state.content['images'],
             default=st.session_state.selected_content.get('images', [])
         )
         
         if st.button("Generate Output"):
             filename = f"{urlparse(url).netloc}_analysis.json"
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(st.session_state.selected_content, f, ensure_ascii=False, indent=2)
+            file_content = orjson.dumps(st.session_state.selected_content, option=orjson.OPT_INDENT_2)
+            with open(filename, "wb") as f:
+                f.write(file_content)
             
             st.success(f"Analysis completed! Selected content saved to {filename}")
             st.download_button(
                 label="Download Selected Content",
-                data=json.dumps(st.session_state.selected_content, ensure_ascii=False, indent=2),
+                data=file_content,
                 file_name=filename,
                 mime="application/json"
             )
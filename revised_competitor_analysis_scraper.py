@@ -1,9 +1,16 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 import re
-import hashlib
+from scrape_utils import (
+    absolute_url, collect_links, content_elements, content_xpath, crawl_levels,
+    fetch_document, fetch_html, site_hosts,
+)
+
+_TEXT_TAGS = frozenset(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'])
+_CONTENT_TAGS = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'a', 'img']
+_BLOG_KEYWORDS = ('blog', 'post', 'article', 'news')
+_BLOG_RE = re.compile('|'.join(_BLOG_KEYWORDS), re.IGNORECASE)
+_CONTENT_XPATH = content_xpath(_CONTENT_TAGS)
 
 def is_valid_url(url):
     try:
@@ -13,87 +20,67 @@ def is_valid_url(url):
         return False
 
 def clean_text(text):
-    return re.sub(r'\s+', ' ', text).strip()
-
-def should_exclude(element):
-    exclude_classes = ['nav', 'menu', 'footer', 'sidebar', 'advertisement', 'cookie', 'popup']
-    exclude_ids = ['nav', 'menu', 'footer', 'sidebar', 'ad']
-    
-    for parent in element.parents:
-        if parent.has_attr('class'):
-            if any(cls in parent.get('class', []) for cls in exclude_classes):
-                return True
-        if parent.has_attr('id'):
-            if any(id in parent.get('id', '') for id in exclude_ids):
-                return True
-    
-    return False
+    return ' '.join(text.split())
 
 def is_blog_post(text):
-    blog_keywords = ['blog', 'post', 'article', 'news']
-    return any(keyword in text.lower() for keyword in blog_keywords)
+    return _BLOG_RE.search(text) is not None
 
-def extract_content(soup, base_url, exclude_types):
+def extract_content(doc, base_url, exclude_types):
     content = []
     seen_content = set()
     
-    for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'a', 'img']):
-        if should_exclude(element):
-            continue
-
-        if element.name in ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li']:
+    for element in content_elements(doc, _CONTENT_XPATH):
+        if element.tag in _TEXT_TAGS:
             if 'text' in exclude_types:
                 continue
-            text = clean_text(element.get_text())
+            text = clean_text(element.text_content())
             if text and len(text) > 20:
-                content_hash = hashlib.md5(text.encode()).hexdigest()
-                if content_hash not in seen_content:
-                    seen_content.add(content_hash)
-                    content.append(f"[{element.name.upper()}] {text}")
-        elif element.name == 'a' and 'links' not in exclude_types:
+                if text not in seen_content:
+                    seen_content.add(text)
+                    content.append(f"[{element.tag.upper()}] {text}")
+        elif element.tag == 'a' and 'links' not in exclude_types:
             href = element.get('href')
             if href:
                 if href.startswith(('http', 'https')):
                     content.append(f"[EXTERNAL LINK] {href}")
                 elif href.startswith('/'):
-                    content.append(f"[INTERNAL LINK] {urljoin(base_url, href)}")
-        elif element.name == 'img' and 'images' not in exclude_types:
+                    content.append(f"[INTERNAL LINK] {absolute_url(base_url, href)}")
+        elif element.tag == 'img' and 'images' not in exclude_types:
             src = element.get('src')
             alt = element.get('alt', '')
             if src:
-                content.append(f"[IMAGE] URL: {urljoin(base_url, src)}, Alt: {alt}")
+                content.append(f"[IMAGE] URL: {absolute_url(base_url, src)}, Alt: {alt}")
 
     return content
 
-def scrape_page(url, depth, max_depth, visited, exclude_types):
-    if depth > max_depth or url in visited:
-        return []
-
-    visited.add(url)
-    try:
-        response = requests.get(url, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        content = extract_content(soup, url, exclude_types)
-        content.insert(0, f"\n[URL] {url}\n")
-        
-        if depth < max_depth:
-            for link in soup.find_all('a', href=True):
-                next_url = urljoin(url, link['href'])
-                if is_valid_url(next_url) and urlparse(next_url).netloc == urlparse(url).netloc:
-                    content.extend(scrape_page(next_url, depth + 1, max_depth, visited, exclude_types))
-        
-        return content
+def scrape_page(url, exclude_types, allowed_hosts, follow_links):
+    doc = fetch_document(url)
+    if doc is None:
+        return [], {}
+    
+    content = [f"\n[URL] {url}\n"]
+    content.extend(extract_content(doc, doc.base_url, exclude_types))
+    
+    links = collect_links(doc, allowed_hosts) if follow_links else {}
     
-    except Exception as e:
-        st.error(f"Error scraping {url}: {str(e)}")
-        return []
+    return content, links
+
+def scrape_site(url, max_depth, exclude_types):
+    content = []
+    allowed_hosts = site_hosts(url)
+
+    def scrape(page_url, follow_links):
+        return scrape_page(page_url, exclude_types, allowed_hosts, follow_links)
+
+    crawl_levels(url, max_depth, scrape, lambda page_url, page_content: content.extend(page_content))
+    return content
 
 def main():
     st.title("Advanced Web Scraper for Competitor Analysis")
 
     url = st.text_input("Enter the website URL to scrape:")
     max_depth = st.number_input("Enter the maximum depth to scrape:", min_value=0, max_value=5, value=1, step=1)
+    refetch = st.checkbox("Refetch pages instead of reusing ones fetched in the last hour", value=False)
     
     exclude_types = st.multiselect(
         "Select content types to exclude:",
@@ -106,22 +93,21 @@ def main():
             st.error("Please enter a valid URL.")
             return
         
+        if refetch:
+            fetch_html.clear()
         st.info("Scraping in progress...")
-        content = scrape_page(url, 0, max_depth, set(), exclude_types)
+        content = scrape_site(url, max_depth, exclude_types)
         
         if content:
             filename = f"{urlparse(url).netloc}_analysis.txt"
+            skip_blog_posts = 'blog posts' in exclude_types
+            file_content = ''.join(line + "\n" for line in content
+                                   if not (skip_blog_posts and is_blog_post(line)))
             with open(filename, "w", encoding="utf-8") as f:
-                for line in content:
-                    if 'blog posts' in exclude_types and is_blog_post(line):
-                        continue
-                    f.write(line + "\n")
+                f.write(file_content)
             
             st.success(f"Analysis completed! Content saved to {filename}")
             
-            with open(filename, "r", encoding="utf-8") as f:
-                file_content = f.read()
-            
             st.download_button(
                 label="Download Content",
                 data=file_content,
@@ -0,0 +1,209 @@
+"""URL, session and fetching helpers shared by the scraper apps.
+
+Kept next to the scripts so `streamlit run <script>.py` can import it.
+"""
+import streamlit as st
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
+from urllib.parse import urljoin, urlsplit, urlunsplit
+import re
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+# Worker threads the requests-based scrapers fetch with
+FETCH_WORKERS = 10
+
+_PCT_RE = re.compile(r'%([0-9A-Fa-f]{2})')
+_UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+_DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+# Links to downloads and assets, which would cost a fetch but never yield a page
+NON_HTML_RE = re.compile(
+    r'\.(?:jpe?g|png|gif|webp|svg|ico|pdf|zip|tar|gz|rar|7z|mp[34]|avi|mov|wmv|webm'
+    r'|docx?|xlsx?|pptx?|csv|css|js|json|xml|woff2?|ttf|eot|exe|dmg)(?:[?#]|$)',
+    re.IGNORECASE
+)
+
+def has_class(cls):
+    """XPath test for cls as a whole token of @class"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+_EXCLUDE_CLASSES = ['nav', 'menu', 'footer', 'sidebar', 'advertisement', 'cookie', 'popup']
+_EXCLUDE_IDS = ['nav', 'menu', 'footer', 'sidebar', 'ad']
+# Excluded containers: classes are matched as whole tokens and ids as substrings
+_EXCLUDED_TEST = ' or '.join(
+    [has_class(cls) for cls in _EXCLUDE_CLASSES]
+    + [f"contains(@id, '{id_}')" for id_ in _EXCLUDE_IDS]
+)
+# Everything below an excluded container
+_EXCLUDED_XPATH = etree.XPath(f'//*[{_EXCLUDED_TEST}]//*')
+_HREF_XPATH = etree.XPath('//a/@href')
+
+def content_xpath(tags, scope='//body'):
+    """Compiled XPath selecting the elements with any of tags under scope"""
+    return etree.XPath(f'{scope}//*[' + ' or '.join(f'self::{tag}' for tag in tags) + ']')
+
+def content_elements(doc, xpath):
+    """Elements matched by xpath (from content_xpath) outside excluded containers"""
+    # Collecting everything under an excluded container once is far cheaper
+    # than testing every content element's ancestors against it
+    excluded = set(_EXCLUDED_XPATH(doc))
+    return [element for element in xpath(doc) if element not in excluded]
+
+def make_session(pool_size):
+    """Session whose keep-alive pool fits pool_size concurrent workers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=Retry(total=2, backoff_factor=0.2))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+_SESSION = make_session(FETCH_WORKERS)
+
+@lru_cache(maxsize=8192)
+def url_netloc(url):
+    # Netloc of an absolute URL, or '' when it has no scheme or cannot be parsed.
+    # Cached because the same nav/footer links turn up on every page
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return ''
+    return parts.netloc.lower() if parts.scheme else ''
+
+@lru_cache(maxsize=256)
+def url_origin(url):
+    parts = urlsplit(url)
+    return f'{parts.scheme}://{parts.netloc}'
+
+def absolute_url(base_url, href):
+    # Absolute and root-relative hrefs, the bulk of them, need no RFC 3986
+    # resolution; protocol-relative and dot-segment paths still use urljoin
+    if href.startswith(('http://', 'https://')):
+        return href
+    if href.startswith('/') and not href.startswith('//') and '/.' not in href:
+        return url_origin(base_url) + href
+    return urljoin(base_url, href)
+
+def site_hosts(url):
+    # The crawl's host plus its www./bare twin, so links written either way
+    # count as same-site
+    netloc = url_netloc(url)
+    twin = netloc[4:] if netloc.startswith('www.') else 'www.' + netloc
+    return frozenset([netloc, twin])
+
+def _normalize_escape(match):
+    char = chr(int(match.group(1), 16))
+    return char if char in _UNRESERVED else '%' + match.group(1).upper()
+
+def _remove_dot_segments(path):
+    # RFC 3986 5.2.4; unlike posixpath.normpath it keeps trailing slashes,
+    # which are part of the resource's identity
+    segments = []
+    for segment in path.split('/'):
+        if segment == '..':
+            if len(segments) > 1:
+                segments.pop()
+        elif segment != '.':
+            segments.append(segment)
+    if path.endswith(('/.', '/..')):
+        segments.append('')
+    return '/'.join(segments)
+
+def normalize_url(url):
+    """Canonical form of a URL (RFC 3986 6.2.2-6.2.3). Only a dedup key:
+    crawlers fetch the URL as it was linked, not this form"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url.split('#', 1)[0]
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    default_port = _DEFAULT_PORTS.get(scheme)
+    if default_port and netloc.endswith(default_port):
+        netloc = netloc[:-len(default_port)]
+    path, query = parts.path, parts.query
+    if '%' in path:
+        path = _PCT_RE.sub(_normalize_escape, path)
+    if '%' in query:
+        query = _PCT_RE.sub(_normalize_escape, query)
+    if '/.' in path:
+        path = _remove_dot_segments(path)
+    if not path and default_port:
+        path = '/'
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+def parse_html(html, content_type, base_url=None):
+    # libxml2 reads bytes with no declared charset as Latin-1, so take the
+    # charset from the header, or assume UTF-8 when the page has no <meta> one.
+    # base_url becomes doc.base_url, which relative links resolve against
+    charset = content_type.partition('charset=')[2].split(';')[0].strip('"\' ')
+    if not charset and b'charset' not in html[:2048].lower():
+        charset = 'utf-8'
+    try:
+        parser = lxml.html.HTMLParser(encoding=charset) if charset else None
+    except LookupError:
+        parser = None
+    return lxml.html.fromstring(html, parser=parser, base_url=base_url)
+
+@st.cache_resource(max_entries=256, ttl=3600, show_spinner=False)
+def fetch_html(url):
+    # Streamed so that same-site links to PDFs, images and other downloads are
+    # dropped once the headers arrive instead of being read and parsed as HTML.
+    # Cached across reruns so scraping again with different options doesn't
+    # refetch; the body is immutable bytes, so each caller parses its own tree.
+    # Error responses raise, and exceptions are never cached
+    with _SESSION.get(url, timeout=10, stream=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', 'text/html')
+        if 'html' not in content_type:
+            return None
+        return response.content, content_type, response.url
+
+def fetch_document(url):
+    # The tree's base_url is the final URL, after any redirect
+    page = fetch_html(url)
+    if page is None:
+        return None
+    return parse_html(*page)
+
+def collect_links(doc, allowed_hosts):
+    """Same-site page links in doc, keyed by normalized URL with the link as
+    written (minus fragment) as the value, which is what gets fetched"""
+    # Pages repeat the same nav links and anchors into themselves, so collapse
+    # those here rather than shipping every copy back. Relative links resolve
+    # against the final URL, after any redirect
+    links = {}
+    for href in _HREF_XPATH(doc):
+        next_url = absolute_url(doc.base_url, href).split('#', 1)[0]
+        if url_netloc(next_url) in allowed_hosts and not NON_HTML_RE.search(next_url):
+            links.setdefault(normalize_url(next_url), next_url)
+    return links
+
+def crawl_levels(url, max_depth, scrape_fn, on_result):
+    """Breadth-first crawl from url, fetching each depth level concurrently.
+
+    scrape_fn(page_url, follow_links) runs on a worker thread and returns
+    (result, links), links as from collect_links(). on_result(page_url, result)
+    is called on this thread in submission order, which also keeps Streamlit
+    calls off the worker threads"""
+    visited = {normalize_url(url)}
+    frontier = [url]
+    depth = 0
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        while frontier and depth <= max_depth:
+            futures = [(page_url, executor.submit(scrape_fn, page_url, depth < max_depth)) for page_url in frontier]
+            frontier = []
+            for page_url, future in futures:
+                try:
+                    result, links = future.result()
+                except Exception as e:
+                    st.error(f"Error scraping {page_url}: {str(e)}")
+                    continue
+                on_result(page_url, result)
+                for key, link in links.items():
+                    if key not in visited:
+                        visited.add(key)
+                        frontier.append(link)
+            depth += 1
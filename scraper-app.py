@@ -1,8 +1,6 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-import os
+from urllib.parse import urlparse
+from scrape_utils import collect_links, crawl_levels, fetch_document, fetch_html, site_hosts
 
 def is_valid_url(url):
     try:
@@ -11,48 +9,59 @@ def is_valid_url(url):
     except ValueError:
         return False
 
-def scrape_page(url, depth, max_depth, visited, base_url):
-    if depth > max_depth or url in visited:
-        return ""
-
-    visited.add(url)
+def scrape_page(url, allowed_hosts, follow_links):
     try:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        doc = fetch_document(url)
+        if doc is None:
+            return '', {}
+        # Resolve against the final URL, after any redirect
+        doc.make_links_absolute()
+        for element in doc.xpath('//script|//style'):
+            element.drop_tree()
         
         # Extract text content
-        text_content = soup.get_text(separator='\n', strip=True)
+        text_content = '\n'.join(text.strip() for text in doc.itertext() if text.strip())
         
         # Extract image URLs
-        image_urls = [urljoin(base_url, img['src']) for img in soup.find_all('img') if 'src' in img.attrs]
+        image_urls = doc.xpath('//img/@src')
         
         # Extract video links
-        video_links = [urljoin(base_url, video['src']) for video in soup.find_all('video') if 'src' in video.attrs]
+        video_links = doc.xpath('//video/@src')
         
-        # Recursively scrape linked pages
-        for link in soup.find_all('a', href=True):
-            next_url = urljoin(base_url, link['href'])
-            if is_valid_url(next_url) and urlparse(next_url).netloc == urlparse(base_url).netloc:
-                text_content += scrape_page(next_url, depth + 1, max_depth, visited, base_url)
+        # Collect same-site links for the next crawl level
+        links = collect_links(doc, allowed_hosts) if follow_links else {}
         
-        return f"URL: {url}\n\nText Content:\n{text_content}\n\nImage URLs:\n{', '.join(image_urls)}\n\nVideo Links:\n{', '.join(video_links)}\n\n{'='*50}\n\n"
+        return f"URL: {url}\n\nText Content:\n{text_content}\n\nImage URLs:\n{', '.join(image_urls)}\n\nVideo Links:\n{', '.join(video_links)}\n\n{'='*50}\n\n", links
     
     except Exception as e:
-        return f"Error scraping {url}: {str(e)}\n\n"
+        return f"Error scraping {url}: {str(e)}\n\n", {}
+
+def scrape_site(base_url, max_depth):
+    allowed_hosts = site_hosts(base_url)
+    pages = []
+
+    def scrape(url, follow_links):
+        return scrape_page(url, allowed_hosts, follow_links)
+
+    crawl_levels(base_url, max_depth, scrape, lambda url, page: pages.append(page))
+    return ''.join(pages)
 
 def main():
     st.title("Website Scraper")
 
     url = st.text_input("Enter the website URL to scrape:")
     max_depth = st.number_input("Enter the maximum depth to scrape:", min_value=1, value=1, step=1)
+    refetch = st.checkbox("Refetch pages instead of reusing ones fetched in the last hour", value=False)
     
     if st.button("Scrape"):
         if not is_valid_url(url):
             st.error("Please enter a valid URL.")
             return
         
+        if refetch:
+            fetch_html.clear()
         st.info("Scraping in progress...")
-        content = scrape_page(url, 0, max_depth, set(), url)
+        content = scrape_site(url, max_depth)
         
         # Save content to a file
         filename = "scraped_content.txt"
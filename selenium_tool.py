@@ -5,63 +5,278 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import lxml.html
+from lxml import etree
+import requests
+from urllib.parse import urlparse
 import re
-import hashlib
-import time
+import threading
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from queue import Queue, Empty
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import orjson
+import time
+import weakref
+import zlib
+from scrape_utils import (
+    NON_HTML_RE, absolute_url, content_elements, content_xpath, has_class,
+    make_session, normalize_url, parse_html,
+)
+
+_DATE_RE = re.compile(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},\s+\d{4}\b')
+_LINK_HINT_RE = re.compile(r'/(?:article|blog|post|news)/', re.IGNORECASE)
+_COOKIE_KEYWORDS = (
+    'cookie', 'gdpr', 'privacy', 'tracking', 'analytics', 'consent',
+    'session', 'storage', 'duration', 'browser', 'local storage',
+    'pixel tracker', 'http cookie'
+)
+# One case-insensitive alternation scans an element's text once for every
+# cookie keyword, instead of lower-casing it and running a search per keyword
+_COOKIE_RE = re.compile('|'.join(re.escape(keyword) for keyword in _COOKIE_KEYWORDS), re.IGNORECASE)
+_BLOG_KEYWORDS = ('blog', 'post', 'article', 'news')
+_BLOG_RE = re.compile('|'.join(_BLOG_KEYWORDS), re.IGNORECASE)
+_UNWANTED_PATTERNS = (
+    '/cookie-policy', '/privacy-policy', '/terms-and-conditions',
+    '/about-us', '/contact', '/careers', '/sitemap'
+)
+_UNWANTED_RE = re.compile('|'.join(re.escape(pattern) for pattern in _UNWANTED_PATTERNS), re.IGNORECASE)
+
+_CONTENT_TAGS = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'a']
+_CONTENT_XPATH = content_xpath(_CONTENT_TAGS, scope='')
+
+# Article cards and the title link inside each one
+_ARTICLE_CARD_XPATH = etree.XPath(
+    f"//article[{has_class('c-article')}] | //div[{has_class('article')}]"
+    f" | //*[{has_class('post')}] | //*[{has_class('blog-post')}]"
+)
+_CARD_LINK_XPATH = etree.XPath(
+    f".//a[{has_class('card-title')}][@href] | .//h2//a[@href] | .//h3//a[@href]"
+    f" | .//*[{has_class('title')}]//a[@href]"
+)
+
+# Finds the numbered pagination button following the active one, using the
+# first selector in arguments[0] that matches anything on the page, and clicks
+# it unless it is disabled, all in one round-trip. The clicked element is
+# returned so the caller can wait for it to go stale
+_CLICK_NEXT_PAGE_JS = """
+for (const selector of arguments[0]) {
+    const buttons = Array.from(document.querySelectorAll(selector));
+    if (!buttons.length) continue;
+    const current = buttons.find(btn => btn.classList.contains('active'));
+    if (!current) return null;
+    const nextNum = parseInt(current.innerText, 10) + 1;
+    const next = buttons.find(btn => /^\\d+$/.test(btn.innerText.trim()) && parseInt(btn.innerText, 10) === nextNum);
+    if (!next || next.hasAttribute('disabled')) return null;
+    next.scrollIntoView(true);
+    next.click();
+    return next;
+}
+return null;
+"""
+
+# Known cookie banner accept buttons, waited for together so a page without a
+# banner costs one timeout rather than one per selector
+_COOKIE_ACCEPT_SELECTOR = ', '.join([
+    '#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll',
+    '.cookie-accept',
+    '#accept-cookies',
+    '[aria-label="Accept cookies"]',
+])
+
+# Tried in order; the first one present on the page is the pagination widget
+_PAGINATION_SELECTORS = [
+    "button.archive__pagination__number",
+    "a.next",
+    ".pagination .next",
+    "[aria-label='Next page']"
+]
+
+# Any of these means the page body has rendered. One comma-joined selector
+# waits for whichever appears first instead of up to 5s per selector in turn
+_MAIN_CONTENT_SELECTOR = ', '.join([
+    ".article-content",
+    ".post-content",
+    ".entry-content",
+    "article",
+    ".content"
+])
+
+# "Load More" controls in a single query; :contains() is jQuery-only, so the
+# text matches are expressed in XPath
+_LOAD_MORE_XPATH = ' | '.join([
+    f"//*[{has_class('load-more')}]",
+    "//*[@id='load-more']",
+    "//*[@aria-label='Load more']",
+    "//button[contains(., 'Load More')]",
+    "//a[contains(., 'Load More')]"
+])
+
+# Pagination or Load More controls in fetched HTML, which only the browser
+# route follows; _PAGINATION_SELECTORS expressed in XPath, since lxml has no
+# CSS support without cssselect
+_LISTING_CONTROLS_XPATH = etree.XPath(' | '.join([
+    f"//button[{has_class('archive__pagination__number')}]",
+    f"//a[{has_class('next')}]",
+    f"//*[{has_class('pagination')}]//*[{has_class('next')}]",
+    "//*[@aria-label='Next page']",
+    _LOAD_MORE_XPATH,
+]))
 
-def create_chrome_options():
+# Images, fonts and media never reach the extracted text, so Chrome is told
+# not to fetch them at all. The globs match the whole URL, so the extension
+# is anchored to the end of the path or the start of the query; a trailing *
+# would also block hosts like *.gifts.com and paths like /topics.icons/
+_BLOCKED_URLS = [pattern for ext in (
+    'jpg', 'jpeg', 'png', 'gif', 'webp', 'avif', 'svg', 'ico',
+    'woff', 'woff2', 'ttf', 'otf', 'mp4', 'webm', 'mp3'
+) for pattern in (f'*.{ext}', f'*.{ext}?*')]
+
+MAX_WORKERS = 5
+# Upper bound on pagination/scroll/Load More rounds on the listing page
+MAX_LOAD_MORE_ROUNDS = 10
+# Default cap on pages per crawl, which grows quickly with max_depth; 0 lifts it
+MAX_URLS = 100
+
+# Rendered pages kept between runs, one zlib-compressed JSON file per URL
+_CACHE_DIR = Path('.scrape_cache')
+# One persistent Chrome profile per pool slot so the HTTP and code caches
+# stay warm between runs (a profile can only be open in one browser)
+_PROFILE_DIR = Path('.chrome_profiles')
+
+# Subsystems a headless scrape never uses
+_CHROME_FLAGS = (
+    '--disable-gpu', '--disable-extensions', '--disable-background-networking',
+    '--disable-default-apps', '--disable-sync', '--disable-client-side-phishing-detection',
+    '--mute-audio', '--no-first-run', '--no-default-browser-check',
+    '--disable-features=Translate,BackForwardCache',
+)
+
+_SESSION = make_session(MAX_WORKERS)
+
+def create_chrome_options(profile_dir=None):
     options = Options()
     options.add_argument('--headless')
     options.add_argument('--no-sandbox')
     options.add_argument('--disable-dev-shm-usage')
+    for flag in _CHROME_FLAGS:
+        options.add_argument(flag)
+    # Catches images served without a file extension, which _BLOCKED_URLS
+    # can't match. Stylesheets stay on: Load More visibility and the scroll
+    # height checks depend on layout
+    options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    if profile_dir is not None:
+        options.add_argument(f'--user-data-dir={profile_dir.resolve()}')
+    # driver.get() returns at DOMContentLoaded instead of waiting for every
+    # image, font and tracking pixel; wait_for_main_content covers the rest
+    options.page_load_strategy = 'eager'
     return options
 
+def create_driver(slot=0):
+    try:
+        driver = webdriver.Chrome(service=Service(), options=create_chrome_options(_PROFILE_DIR / str(slot)))
+    except WebDriverException:
+        # The profile is locked by a browser from another run still going;
+        # fall back to a throwaway one
+        driver = webdriver.Chrome(service=Service(), options=create_chrome_options())
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': _BLOCKED_URLS})
+    return driver
+
+class _SessionDriver:
+    """Owns the session's listing driver. Chrome is quit when the Streamlit
+    session drops this holder (or its replacement is stored), or at exit"""
+    def __init__(self, driver):
+        self.driver = driver
+        weakref.finalize(self, driver.quit)
+
+def session_driver():
+    """Listing driver kept in st.session_state so Chrome starts once per
+    Streamlit session rather than once per Scrape click"""
+    holder = st.session_state.get('driver')
+    if holder is not None:
+        try:
+            holder.driver.current_url
+            return holder.driver
+        except Exception:
+            # Chrome crashed or was closed since the last run; a dead
+            # chromedriver surfaces as a urllib3 error, not WebDriverException
+            pass
+    driver = create_driver(0)
+    st.session_state.driver = _SessionDriver(driver)
+    return driver
+
+class _DriverPool:
+    """Drivers shared by the crawl's workers, starting with the session's
+    listing driver. Most article pages are served by a plain GET, so extra
+    Chrome instances are only started when a worker needs one and every
+    existing driver is busy, up to max_size in total"""
+    def __init__(self, driver, max_size):
+        self.drivers = [driver]
+        self._idle = Queue()
+        self._idle.put(driver)
+        self._max_size = max_size
+        self._started = 1
+        self._lock = threading.Lock()
+
+    def get(self):
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+        with self._lock:
+            slot = self._started if self._started < self._max_size else None
+            if slot is not None:
+                self._started += 1
+        if slot is None:
+            return self._idle.get()
+        try:
+            driver = create_driver(slot)
+        except Exception:
+            with self._lock:
+                self._started -= 1
+            raise
+        with self._lock:
+            self.drivers.append(driver)
+        return driver
+
+    def put(self, driver):
+        self._idle.put(driver)
+
 def is_valid_url(url):
+    # Fast path for the common absolute http(s) URL: valid when a host follows
+    if url.startswith(('http://', 'https://')):
+        rest = url.split('://', 1)[1]
+        return bool(rest) and rest[0] not in '/?#'
     try:
         result = urlparse(url)
         return all([result.scheme, result.netloc])
     except ValueError:
         return False
 
-def clean_text(text):
-    return re.sub(r'\s+', ' ', text).strip()
+@lru_cache(maxsize=None)
+def site_prefixes(base_url):
+    """Return the base URL under both http and https for prefix checks"""
+    # Normalised the same way as queued URLs so host case and default ports
+    # in the typed URL don't make every link look external
+    rest = normalize_url(base_url).split('://', 1)[-1]
+    return ('http://' + rest, 'https://' + rest)
 
-def should_exclude(element):
-    exclude_classes = ['nav', 'menu', 'footer', 'sidebar', 'advertisement', 'cookie', 'popup']
-    exclude_ids = ['nav', 'menu', 'footer', 'sidebar', 'ad']
-    
-    cookie_keywords = [
-        'cookie', 'gdpr', 'privacy', 'tracking', 'analytics', 'consent',
-        'session', 'storage', 'duration', 'browser', 'local storage',
-        'pixel tracker', 'http cookie'
-    ]
-    
-    text = element.get_text().lower()
-    if any(keyword in text for keyword in cookie_keywords):
-        return True
+def clean_text(text):
+    return ' '.join(text.split())
 
-    for parent in element.parents:
-        if parent.has_attr('class'):
-            if any(cls in parent.get('class', []) for cls in exclude_classes):
-                return True
-        if parent.has_attr('id'):
-            if any(id in parent.get('id', '') for id in exclude_ids):
-                return True
-    
-    return False
+def should_exclude(text):
+    return _COOKIE_RE.search(text) is not None
 
 def is_blog_post(text):
-    blog_keywords = ['blog', 'post', 'article', 'news']
-    return any(keyword in text.lower() for keyword in blog_keywords)
+    return _BLOG_RE.search(text) is not None
 
 def is_after_date(text, target_date):
-    date_pattern = r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},\s+\d{4}\b'
-    match = re.search(date_pattern, text)
+    match = _DATE_RE.search(text)
     if match:
         date_str = match.group(0)
         date = datetime.strptime(date_str, '%b %d, %Y')
@@ -69,105 +284,108 @@ def is_after_date(text, target_date):
     return True
 
 def is_unwanted_link(url, base_url):
-    unwanted_patterns = [
-        '/cookie-policy', '/privacy-policy', '/terms-and-conditions',
-        '/about-us', '/contact', '/careers', '/sitemap'
-    ]
-    is_external = not url.startswith(base_url)
-    return any(pattern in url.lower() for pattern in unwanted_patterns) or is_external
+    if not url.startswith(site_prefixes(base_url)):
+        return True
+    return _UNWANTED_RE.search(url) is not None
 
 def handle_cookie_consent(driver):
-    common_selectors = [
-        '#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll',
-        '.cookie-accept',
-        '#accept-cookies',
-        '[aria-label="Accept cookies"]',
-    ]
-    
-    for selector in common_selectors:
-        try:
-            accept_button = WebDriverWait(driver, 2).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-            )
-            accept_button.click()
-            time.sleep(1)
-            return
-        except:
-            continue
+    try:
+        accept_button = WebDriverWait(driver, 3).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, _COOKIE_ACCEPT_SELECTOR))
+        )
+        accept_button.click()
+    except WebDriverException:
+        return
+    try:
+        WebDriverWait(driver, 2).until(EC.invisibility_of_element(accept_button))
+    except TimeoutException:
+        pass
+
+def needs_js(doc, min_blocks=3):
+    """Check whether server-rendered HTML is missing the main content"""
+    return len(doc.xpath('//article | //main//p')) < min_blocks
+
+def fetch_static_html(url):
+    response = _SESSION.get(url, timeout=10)
+    response.raise_for_status()
+    return response.content, response.headers.get('Content-Type', ''), response.url
 
-def gather_page_content(driver, base_url):
+def fetch_static_page(url):
+    html, content_type, page_url = fetch_static_html(url)
+    return parse_html(html, content_type), page_url
+
+def wait_for_scroll_growth(driver, last_height, timeout=3):
+    """Wait until the page grows past last_height and return the new height"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            lambda d: d.execute_script("return document.body.scrollHeight") > last_height
+        )
+    except TimeoutException:
+        pass
+    return driver.execute_script("return document.body.scrollHeight")
+
+def wait_for_main_content(driver):
+    try:
+        WebDriverWait(driver, 5).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, _MAIN_CONTENT_SELECTOR))
+        )
+    except TimeoutException:
+        pass
+
+def gather_page_content(doc, page_url, base_url):
     """Gather content from current page using multiple strategies"""
-    links = []
+    links = set()
+    
+    # Query the parsed page locally rather than making a WebDriver round-trip
+    # per element
+    prefixes = site_prefixes(base_url)
     
     # Strategy 1: Article cards
-    articles = driver.find_elements(By.CSS_SELECTOR, "article.c-article, div.article, .post, .blog-post")
-    for article in articles:
-        try:
-            link = article.find_element(By.CSS_SELECTOR, "a.card-title, h2 a, h3 a, .title a").get_attribute('href')
-            if link and is_valid_url(link) and link.startswith(base_url):
-                links.append(link)
-        except:
-            continue
+    for article in _ARTICLE_CARD_XPATH(doc):
+        anchors = _CARD_LINK_XPATH(article)
+        if anchors:
+            # Anything under the base prefixes already has a scheme and host
+            link = absolute_url(page_url, anchors[0].get('href'))
+            if link.startswith(prefixes) and not NON_HTML_RE.search(link):
+                links.add(link)
 
     # Strategy 2: General article links 
-    article_links = driver.find_elements(By.TAG_NAME, 'a')
-    for link in article_links:
-        try:
-            href = link.get_attribute('href')
-            if href and is_valid_url(href) and href.startswith(base_url):
-                if any(pattern in href.lower() for pattern in ['/article/', '/blog/', '/post/', '/news/']):
-                    links.append(href)
-        except:
-            continue
+    for href in doc.xpath('//a/@href'):
+        href = absolute_url(page_url, href)
+        if href.startswith(prefixes) and not NON_HTML_RE.search(href):
+            if _LINK_HINT_RE.search(href):
+                links.add(href)
 
-    return list(set(links))
+    return list(links)
 
-def load_more_content(driver, base_url):
+def load_more_content(driver, base_url, max_rounds=MAX_LOAD_MORE_ROUNDS):
     """Load content using multiple strategies"""
-    all_links = []
+    all_links = set()
     content_loaded = True
+    rounds = 0
     
-    while content_loaded:
-        current_links = gather_page_content(driver, base_url)
+    while content_loaded and rounds < max_rounds:
+        rounds += 1
+        doc = lxml.html.fromstring(driver.page_source)
+        current_links = gather_page_content(doc, driver.current_url, base_url)
         new_links = [link for link in current_links if link not in all_links]
         
         if not new_links:
             content_loaded = False
             continue
             
-        all_links.extend(new_links)
+        all_links.update(new_links)
         
         # Strategy 1: Try pagination buttons
         try:
-            next_button = None
-            pagination_selectors = [
-                "button.archive__pagination__number",
-                "a.next",
-                ".pagination .next",
-                "[aria-label='Next page']"
-            ]
+            next_button = driver.execute_script(_CLICK_NEXT_PAGE_JS, _PAGINATION_SELECTORS)
             
-            for selector in pagination_selectors:
-                buttons = driver.find_elements(By.CSS_SELECTOR, selector)
-                if buttons:
-                    current_page = next(
-                        (btn for btn in buttons if 'active' in btn.get_attribute('class').split()),
-                        None
-                    )
-                    
-                    if current_page:
-                        current_num = int(current_page.text)
-                        next_button = next(
-                            (btn for btn in buttons if btn.text.isdigit() and int(btn.text) == current_num + 1),
-                            None
-                        )
-                    break
-            
-            if next_button and not next_button.get_attribute('disabled'):
-                driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-                time.sleep(1)
-                driver.execute_script("arguments[0].click();", next_button)
-                time.sleep(3)
+            if next_button:
+                # Pagination widgets are re-rendered once the next page loads
+                try:
+                    WebDriverWait(driver, 5).until(EC.staleness_of(next_button))
+                except TimeoutException:
+                    pass
                 continue
         except:
             pass
@@ -175,136 +393,259 @@ def load_more_content(driver, base_url):
         # Strategy 2: Try infinite scroll
         last_height = driver.execute_script("return document.body.scrollHeight")
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(3)
+        new_height = wait_for_scroll_growth(driver, last_height)
         
-        new_height = driver.execute_script("return document.body.scrollHeight")
         if new_height == last_height:
             # Try one more scroll to be sure
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
-            final_height = driver.execute_script("return document.body.scrollHeight")
+            final_height = wait_for_scroll_growth(driver, new_height)
             if final_height == new_height:
                 content_loaded = False
         
         # Strategy 3: Look for "Load More" buttons
         try:
-            load_more_selectors = [
-                ".load-more",
-                "#load-more",
-                "[aria-label='Load more']",
-                "button:contains('Load More')",
-                "a:contains('Load More')"
-            ]
-            
-            for selector in load_more_selectors:
-                load_more = driver.find_element(By.CSS_SELECTOR, selector)
-                if load_more and load_more.is_displayed():
+            for load_more in driver.find_elements(By.XPATH, _LOAD_MORE_XPATH):
+                if load_more.is_displayed():
+                    height = driver.execute_script("return document.body.scrollHeight")
                     driver.execute_script("arguments[0].click();", load_more)
-                    time.sleep(3)
+                    wait_for_scroll_growth(driver, height)
                     content_loaded = True
                     break
         except:
             pass
             
-    return list(set(all_links))
+    return list(all_links)
 
-def extract_content(driver, base_url, exclude_types):
+def extract_content(doc, base_url, exclude_types):
     content = []
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    
-    # Wait for main content
-    try:
-        content_selectors = [
-            ".article-content",
-            ".post-content",
-            ".entry-content", 
-            "article",
-            ".content"
-        ]
-        
-        for selector in content_selectors:
-            try:
-                WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                break
-            except:
+    include_text = 'text' not in exclude_types
+    include_links = 'links' not in exclude_types
+
+    for element in content_elements(doc, _CONTENT_XPATH):
+        # Cheap tag/attribute checks first, so elements that can't produce
+        # output never have their subtree text pulled and scanned
+        if element.tag != 'a':
+            if not include_text:
+                continue
+        else:
+            href = element.get('href')
+            if not include_links or not href:
                 continue
-    except:
-        pass
 
-    for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'a']):
-        if should_exclude(element):
+        # Pull the text once; it feeds both the cookie check and the output
+        text = element.text_content()
+        if should_exclude(text):
             continue
 
-        if element.name in ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li']:
-            if 'text' not in exclude_types:
-                text = clean_text(element.get_text())
-                if text and len(text) > 20:
-                    content.append(f"[{element.name.upper()}] {text}\n")
-        elif element.name == 'a' and 'links' not in exclude_types:
-            href = element.get('href')
-            if href:
-                if href.startswith(('http', 'https')):
-                    content.append(f"[EXTERNAL LINK] {href}\n")
-                elif href.startswith('/'):
-                    content.append(f"[INTERNAL LINK] {urljoin(base_url, href)}\n")
+        if element.tag != 'a':
+            text = clean_text(text)
+            if text and len(text) > 20:
+                content.append(f"[{element.tag.upper()}] {text}\n")
+        elif href.startswith(('http', 'https')):
+            content.append(f"[EXTERNAL LINK] {href}\n")
+        elif href.startswith('/'):
+            content.append(f"[INTERNAL LINK] {absolute_url(base_url, href)}\n")
 
     return content
 
-def scrape_single_page(url, base_url, exclude_types):
-    options = create_chrome_options()
-    driver = webdriver.Chrome(service=Service(), options=options)
+def _cache_path(url):
+    return _CACHE_DIR / (hashlib.blake2b(url.encode(), digest_size=16).hexdigest() + '.json.z')
+
+def page_validators(url):
+    """ETag/Last-Modified the server reports for url, if any"""
     try:
-        driver.get(url)
-        handle_cookie_consent(driver)
-        time.sleep(2)
-        return extract_content(driver, base_url, exclude_types)
-    finally:
-        driver.quit()
+        response = _SESSION.head(url, timeout=5, allow_redirects=True)
+    except requests.RequestException:
+        return {}
+    if not response.ok:
+        return {}
+    return {key: response.headers[key] for key in ('ETag', 'Last-Modified') if key in response.headers}
+
+def is_unchanged(url, validators):
+    """Conditional HEAD: True when the server confirms the cached render is current"""
+    if not validators:
+        return False
+    headers = {}
+    if 'ETag' in validators:
+        headers['If-None-Match'] = validators['ETag']
+    if 'Last-Modified' in validators:
+        headers['If-Modified-Since'] = validators['Last-Modified']
+    try:
+        response = _SESSION.head(url, headers=headers, timeout=5, allow_redirects=True)
+    except requests.RequestException:
+        return False
+    if response.status_code == 304:
+        return True
+    # Some servers ignore conditional headers but still report the same validators
+    return response.ok and all(response.headers.get(key) == value for key, value in validators.items())
+
+def load_cached_page(url, max_age):
+    """Return (html, page_url) rendered for url within max_age seconds, or
+    older if the server confirms it hasn't changed since; otherwise None"""
+    path = _cache_path(url)
+    try:
+        age = time.time() - path.stat().st_mtime
+        entry = orjson.loads(zlib.decompress(path.read_bytes()))
+    except (OSError, ValueError, zlib.error):
+        return None
+    if age > max_age:
+        if not is_unchanged(url, entry.get('validators')):
+            return None
+        # Revalidated, so it counts as fresh again
+        path.touch()
+    return entry['html'], entry['url']
+
+def save_cached_page(url, html, page_url):
+    _CACHE_DIR.mkdir(exist_ok=True)
+    entry = orjson.dumps({'url': page_url, 'html': html, 'validators': page_validators(url)})
+    _cache_path(url).write_bytes(zlib.compress(entry))
+
+def scrape_single_page(driver_pool, url, base_url, exclude_types, collect_links, cache_ttl, seen_pages):
+    content_type = None
+    doc = None
+    cached = load_cached_page(url, cache_ttl) if driver_pool is not None and cache_ttl else None
+    if cached:
+        # Rendered recently enough; skip the browser entirely
+        html, page_url = cached
+    elif driver_pool is None:
+        html, content_type, page_url = fetch_static_html(url)
+    else:
+        # Even on a JS-heavy listing many article pages are rendered
+        # server-side, and a plain GET is far cheaper than a Chrome load
+        try:
+            html, content_type, page_url = fetch_static_html(url)
+            doc = parse_html(html, content_type)
+        except (requests.RequestException, etree.ParserError):
+            pass
+        if doc is None or needs_js(doc, 1):
+            doc = content_type = None
+            # Each worker checks out a driver for the duration of one page, so a
+            # driver is never shared between threads and Chrome is only started
+            # once per worker rather than once per URL
+            driver = driver_pool.get()
+            try:
+                driver.get(url)
+                handle_cookie_consent(driver)
+                wait_for_main_content(driver)
+                html, page_url = driver.page_source, driver.current_url
+            finally:
+                driver_pool.put(driver)
+            if cache_ttl:
+                save_cached_page(url, html, page_url)
+
+    # Sites often serve the same page under several URLs; hashing the markup
+    # is far cheaper than parsing and extracting it all over again.
+    # setdefault is atomic, so only the first worker to see a page claims it
+    raw = html if isinstance(html, bytes) else html.encode('utf-8')
+    original = seen_pages.setdefault(hashlib.blake2b(raw, digest_size=16).digest(), url)
+    if original != url:
+        return [f"(duplicate of {original})\n"], []
+
+    if doc is None:
+        doc = parse_html(html, content_type) if content_type is not None else lxml.html.fromstring(html)
+    # Parse once and share the tree between content and link extraction
+    content = extract_content(doc, base_url, exclude_types)
+    links = gather_page_content(doc, page_url, base_url) if collect_links else []
+    return content, links
 
-def scrape_pages(base_url, initial_url, max_depth, exclude_types, max_urls, target_date, progress_bar):
+def queue_new_links(links, depth, queued, to_visit):
+    """Queue links not seen before. They are deduplicated on their normalized
+    form but fetched as linked, since that is the URL the site serves"""
+    for link in links:
+        key = normalize_url(link)
+        if key not in queued:
+            queued.add(key)
+            to_visit.append((link.split('#', 1)[0], depth))
+
+def scrape_pages(base_url, initial_url, max_depth, exclude_types, max_urls, target_date, progress_bar, out, cache_ttl=0, max_load_rounds=MAX_LOAD_MORE_ROUNDS):
+    """Crawl from initial_url, writing each page's lines to out as it completes.
+    Returns the first lines written, for previewing"""
     visited = set()
-    all_content = []
+    seen_pages = {}
+    preview = []
+    skip_blog_posts = 'blog posts' in exclude_types
     
-    options = create_chrome_options()
-    driver = webdriver.Chrome(service=Service(), options=options)
+    # Probe the start page over plain HTTP first; sites that render their
+    # content server-side are crawled without starting Chrome at all, unless
+    # the listing has pagination or Load More controls to work through
+    try:
+        doc, page_url = fetch_static_page(initial_url)
+        use_browser = needs_js(doc) or bool(_LISTING_CONTROLS_XPATH(doc))
+    except (requests.RequestException, etree.ParserError):
+        use_browser = True
+
+    driver_pool = None
     try:
-        driver.get(initial_url)
-        handle_cookie_consent(driver)
-        time.sleep(2)
-        all_links = load_more_content(driver, base_url)
+        if use_browser:
+            driver = session_driver()
+            # Reuse the listing driver; extra ones start on demand
+            driver_pool = _DriverPool(driver, MAX_WORKERS)
+            driver.get(initial_url)
+            handle_cookie_consent(driver)
+            wait_for_main_content(driver)
+            all_links = load_more_content(driver, base_url, max_load_rounds)
+        else:
+            all_links = gather_page_content(doc, page_url, base_url)
+
+        # Breadth-first crawl: links found on the listing page are depth 1 and
+        # pages keep contributing links until max_depth is reached. URLs are
+        # deduplicated when they are queued, so a page linked from many
+        # others is only scheduled once
+        queued = set()
+        to_visit = deque()
+        queue_new_links(all_links, 1, queued, to_visit)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            while to_visit:
+                future_to_url = {}
+                while to_visit:
+                    if max_urls and len(visited) >= max_urls:
+                        to_visit.clear()
+                        break
+                    url, depth = to_visit.popleft()
+                    if not is_unwanted_link(url, base_url):
+                        visited.add(url)
+                        future = executor.submit(scrape_single_page, driver_pool, url, base_url, exclude_types, depth < max_depth, cache_ttl, seen_pages)
+                        future_to_url[future] = (url, depth)
+
+                for future in as_completed(future_to_url):
+                    url, depth = future_to_url[future]
+                    try:
+                        content, links = future.result()
+                        progress_bar.text(f"Scraped: {url}")
+                        st.session_state.scraped_urls.append(url)
+                        lines = [f"\n[URL] {url}\n"]
+                        lines.extend(content)
+                        if skip_blog_posts:
+                            lines = [line for line in lines if not is_blog_post(line)]
+                        out.writelines(lines)
+                        if len(preview) < 20:
+                            preview.extend(lines[:20 - len(preview)])
+                        queue_new_links(links, depth + 1, queued, to_visit)
+                    except Exception as e:
+                        st.error(f"Error scraping {url}: {str(e)}")
     finally:
-        driver.quit()
-    
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_url = {}
-        for url in all_links:
-            if max_urls is None or len(visited) < max_urls:
-                if url not in visited and not is_unwanted_link(url, base_url):
-                    visited.add(url)
-                    future_to_url[executor.submit(scrape_single_page, url, base_url, exclude_types)] = url
-
-        for future in as_completed(future_to_url):
-            url = future_to_url[future]
+        # The first driver belongs to the Streamlit session and is kept for
+        # the next run, parked on a blank page so the listing's scripts and
+        # memory are released in the meantime
+        if driver_pool is not None:
+            for driver in driver_pool.drivers[1:]:
+                driver.quit()
             try:
-                content = future.result()
-                progress_bar.text(f"Scraped: {url}")
-                st.session_state.scraped_urls.append(url)
-                all_content.extend([f"\n[URL] {url}\n"])
-                all_content.extend(content)
-            except Exception as e:
-                st.error(f"Error scraping {url}: {str(e)}")
+                driver_pool.drivers[0].get('about:blank')
+            except Exception:
+                pass
 
-    return all_content
+    return preview
 
 def main():
     st.title("Advanced Web Scraper for Competitor Analysis")
 
     url = st.text_input("Enter the website URL to scrape:")
     max_depth = st.number_input("Enter the maximum depth to scrape:", min_value=0, max_value=5, value=1, step=1)
-    max_urls = st.number_input("Maximum number of URLs to scrape (leave blank for no limit):", min_value=1, value=None)
+    max_urls = st.number_input("Maximum number of URLs to scrape (0 for no limit):", min_value=0, value=MAX_URLS, step=1)
     date_filter = st.date_input("Only include content published after (leave blank for no filter):", value=None)
+    max_load_rounds = st.number_input("Maximum pagination / Load More rounds on the start page:", min_value=1, value=MAX_LOAD_MORE_ROUNDS, step=1)
+    cache_hours = st.number_input("Reuse pages rendered within the last N hours (0 to always re-render):", min_value=0, value=0, step=1)
     
     exclude_types = st.multiselect(
         "Select content types to exclude:",
@@ -323,35 +664,30 @@ def main():
         
         try:
             target_date = datetime.combine(date_filter, datetime.min.time()) if date_filter else None
-            content = scrape_pages(url, url, max_depth, exclude_types, max_urls, target_date, progress_bar)
+            filename = f"{urlparse(url).netloc}_analysis.txt"
+            # Pages are written as they finish rather than held until the end
+            with open(filename, "w", encoding="utf-8") as f:
+                preview = scrape_pages(url, url, max_depth, exclude_types, max_urls, target_date, progress_bar, f, cache_hours * 3600, max_load_rounds)
             
-            if content:
-                filename = f"{urlparse(url).netloc}_analysis.txt"
-                with open(filename, "w", encoding="utf-8") as f:
-                    for line in content:
-                        if 'blog posts' in exclude_types and is_blog_post(line):
-                            continue
-                        f.write(line)
-                
+            if preview:
                 st.success(f"Analysis completed! Content saved to {filename}")
                 
-                with open(filename, "r", encoding="utf-8") as f:
-                    file_content = f.read()
-                
-                st.download_button(
-                    label="Download Content",
-                    data=file_content,
-                    file_name=filename,
-                    mime="text/plain"
-                )
+                with open(filename, "rb") as f:
+                    st.download_button(
+                        label="Download Content",
+                        data=f,
+                        file_name=filename,
+                        mime="text/plain"
+                    )
                 
                 st.subheader("Preview of Extracted Content")
-                st.text_area("Content Preview", value="".join(content[:20]), height=300)
+                st.text_area("Content Preview", value="".join(preview), height=300)
                 
                 st.subheader("Scraped URLs")
                 for url in st.session_state.scraped_urls:
                     st.write(url)
             else:
+                Path(filename).unlink(missing_ok=True)
                 st.warning("No content could be extracted. Please check the URL and try again.")
             
         except Exception as e: